@@ -1,89 +1,146 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, delete, func 
+from sqlalchemy import insert, update, delete, func, bindparam
+from sqlalchemy.exc import IntegrityError
 from typing import Optional, List
+import time
 
 from . import models, schemas
 
+# In-process cache for the customer COUNT(*) - the count is allowed to be a few seconds stale
+COUNT_CACHE_TTL = 5.0 # seconds
+_count_cache = {"value": None, "ts": 0.0}
+
+# Hot statements are built once at import and executed with bound parameters, so each request skips
+# constructing the statement and always hits the same entry in SQLAlchemy's compiled cache
+_GET_BY_ID = select(models.Customer).where(models.Customer.id == bindparam("customer_id"))
+_COUNT = select(func.count()).select_from(models.Customer)
+_CUSTOMER_COLUMNS = (models.Customer.id, models.Customer.name, models.Customer.age, models.Customer.email)
+_GET_ROW_BY_ID = select(*_CUSTOMER_COLUMNS).where(models.Customer.id == bindparam("customer_id"))
+_LOCK_ROW_BY_ID = _GET_ROW_BY_ID.with_for_update()
+
 # ---- READ ---- #
 async def get_customer(db: AsyncSession, customer_id: int) -> Optional[models.Customer]:
   """
   Retrieve a single customer by their ID
   """
-  query = select(models.Customer).filter(models.Customer.id == customer_id)
-  result = await db.execute(query)
+  result = await db.execute(_GET_BY_ID, {"customer_id": customer_id})
   return result.scalars().first()
 
-async def get_customer_by_email(db: AsyncSession, email: str) -> Optional[models.Customer]:
+async def _get_customer_row(db: AsyncSession, customer_id: int) -> Optional[schemas.Customer]:
   """
-  Retrieve a single customer by their email
+  Retrieve a single customer by their ID as a plain schema, without loading an ORM object
   """
-  query = select(models.Customer).filter(models.Customer.email == email)
-  result = await db.execute(query)
-  return result.scalars().first()
+  result = await db.execute(_GET_ROW_BY_ID, {"customer_id": customer_id})
+  row = result.first()
+  return schemas.Customer.model_construct(**row._mapping) if row else None
 
-async def get_customers(db: AsyncSession, skip: int=0, limit: int=100) -> schemas.PaginatedCustomerResponse:
+async def get_customers(db: AsyncSession, after_id: Optional[int]=None, skip: int=0, limit: int=100) -> schemas.PaginatedCustomerResponse:
   """
-  Retrieve a list of customers
+  Retrieve a page of customers ordered by ID
+  Uses keyset pagination (WHERE id > after_id) when a cursor is given, otherwise falls back to skip/limit
   """
-  query = select(models.Customer).offset(skip).limit(limit)
+  # Plain column tuples rather than ORM objects - skips identity-map and attribute instrumentation for every row
+  query = select(*_CUSTOMER_COLUMNS).order_by(models.Customer.id).limit(limit)
+  if after_id is not None:
+    query = query.where(models.Customer.id > after_id)
+  else:
+    query = query.offset(skip)
   result = await db.execute(query)
-  records = result.scalars().all()
-  total = await get_customer_count(db)
+  # Rows come straight from the database, so build the schemas without re-running validation
+  records = [schemas.Customer.model_construct(**row._mapping) for row in result]
 
-  return schemas.PaginatedCustomerResponse(records=records, total=total, skip=skip, limit=limit)
+  # Only hand out a cursor when the page was full, otherwise there is nothing left to fetch
+  next_cursor = records[-1].id if len(records) == limit else None
+  return schemas.PaginatedCustomerResponse(records=records, next_cursor=next_cursor, skip=skip, limit=limit)
 
 async def get_customer_count(db: AsyncSession) -> int:
   """
   Retrieve the total count of customers in the database
+  Served from the in-process cache while it is fresh, otherwise runs COUNT(*) and refreshes the cache
   """
-  query = select(func.count()).select_from(models.Customer)
-  result = await db.execute(query)
-  return result.scalar_one_or_none() or 0
+  if _count_cache["value"] is not None and time.monotonic() - _count_cache["ts"] < COUNT_CACHE_TTL:
+    return _count_cache["value"]
+
+  result = await db.execute(_COUNT)
+  count = result.scalar_one_or_none() or 0
+
+  _count_cache["value"] = count
+  _count_cache["ts"] = time.monotonic()
+  return count
+
+def _adjust_cached_count(delta: int) -> None:
+  """
+  Keep a warm count cache in step with single-row writes
+  """
+  if _count_cache["value"] is not None:
+    _count_cache["value"] += delta
+
+def invalidate_customer_count() -> None:
+  """
+  Drop the cached count so the next read goes to the database (used after bulk writes)
+  """
+  _count_cache["value"] = None
 
 # ---- CREATE ---- #
-async def create_customer(db: AsyncSession, customer: schemas.CustomerCreate) -> models.Customer:
+async def create_customer(db: AsyncSession, customer: schemas.CustomerCreate) -> schemas.Customer:
   """
   Create a new customer in the database
+  Raises IntegrityError if the email is already taken - the unique index on email does the checking
   """
-  # Create a new Customer model instance
-  customer = models.Customer(
-    name=customer.name,
-    email=customer.email,
-    age=customer.age
-  )
+  customer_data = customer.model_dump()
 
-  # Commit the changes to the database
-  db.add(customer)
-  await db.commit()
-  await db.refresh(customer)
-  return customer
+  # Single INSERT - MySQL has no INSERT ... RETURNING, but the driver reports the new ID without another query
+  try:
+    result = await db.execute(insert(models.Customer).values(**customer_data))
+    await db.commit()
+  except IntegrityError:
+    await db.rollback()
+    raise
+  _adjust_cached_count(1)
+  return schemas.Customer.model_construct(id=result.inserted_primary_key[0], **customer_data)
 
 # ---- UPDATE ---- #
-async def update_customer(db: AsyncSession, customer_id: int, customer_update: schemas.CustomerUpdate) -> Optional[models.Customer]:
+async def update_customer(db: AsyncSession, customer_id: int, customer_update: schemas.CustomerUpdate) -> Optional[schemas.Customer]:
   """
-  Update an existing customer
+  Update an existing customer. Returns the updated customer or None if not found
+  Raises IntegrityError if the new email is already taken - the unique index on email does the checking
   """
-  # Fetch the customer to be updated
-  customer = await get_customer(db, customer_id)
-  if not customer:
-    return None
-
-  # Only update the fields that were actually provided in the request
-  update_data = customer_update.model_dump(exclude_unset=True)
+  # Only update the fields that were actually provided in the request (every column is NOT NULL, so explicit nulls are ignored)
+  update_data = customer_update.model_dump(exclude_unset=True, exclude_none=True)
   # If no fields were provided, return the existing customer
   if not update_data:
-    return customer
+    return await _get_customer_row(db, customer_id)
+
+  try:
+    # Read and lock the current row so nothing can change it between the comparison and the UPDATE
+    result = await db.execute(_LOCK_ROW_BY_ID, {"customer_id": customer_id})
+    row = result.first()
+    if row is None:
+      await db.rollback()
+      return None
+    current = dict(row._mapping)
 
-  # Update the customer attributes
-  for key, value in update_data.items():
-    setattr(customer, key, value)
+    # Skip the write entirely when every provided field already has that value
+    changed = {key: value for key, value in update_data.items() if current[key] != value}
+    if not changed:
+      await db.rollback() # Nothing was written, just release the lock
+      return schemas.Customer.model_construct(**current)
 
-  # Commit the changes to the database
-  db.add(customer)
-  await db.commit() 
-  await db.refresh(customer) 
-  return customer
+    # Single UPDATE statement instead of setattr per field -> flush -> refresh
+    query = (
+      update(models.Customer)
+      .where(models.Customer.id == customer_id)
+      .values(**changed)
+      .execution_options(synchronize_session=False)
+    )
+    await db.execute(query)
+    await db.commit()
+  except IntegrityError:
+    await db.rollback()
+    raise
+  # The new row is the locked row plus the changes, so there is no need to read it back
+  return schemas.Customer.model_construct(**{**current, **changed})
 
 # ---- DELETE ---- #
 async def delete_customer(db: AsyncSession, customer_id: int) -> Optional[models.Customer]:
@@ -98,4 +155,5 @@ async def delete_customer(db: AsyncSession, customer_id: int) -> Optional[models
   # Delete the customer
   await db.delete(customer)
   await db.commit()
+  _adjust_cached_count(-1)
   return customer
\ No newline at end of file
@@ -1,19 +1,35 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import text
 from dotenv import load_dotenv
+import asyncio
 import os
 
+DOTENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+
 # Load environment variables from .env file
-current_dir = os.path.dirname(os.path.abspath(__file__))
-dotenv_path = os.path.join(current_dir, '.env')
-load_dotenv(dotenv_path=dotenv_path)
+load_dotenv(dotenv_path=DOTENV_PATH)
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Set SQL_ECHO=1 to log every SQL statement - off by default since formatting each statement is costly
+SQL_ECHO = os.getenv("SQL_ECHO", "").lower() in ("1", "true", "yes")
+# Fixed-size connection pool, filled at startup by warm_up_pool()
+POOL_SIZE = 20
+
 # Create an asynchronous engine
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_async_engine(
+  DATABASE_URL,
+  echo=SQL_ECHO,
+  pool_size=POOL_SIZE,
+  max_overflow=0,
+  pool_pre_ping=True,
+  pool_recycle=1800, # Recycle connections before MySQL's wait_timeout closes them
+  query_cache_size=1200 # Room in SQLAlchemy's compiled statement cache (default 500)
+)
 
-# Create a base class for declarative models
-Base = declarative_base()
+# Base class for declarative models (SQLAlchemy 2.0 style)
+class Base(DeclarativeBase):
+  pass
 
 # Create a sessionmaker for creating AsyncSession instances
 AsyncSessionLocal = async_sessionmaker(
@@ -21,6 +37,35 @@ AsyncSessionLocal = async_sessionmaker(
   expire_on_commit=False
 )
 
+# Name of the MySQL lock that serialises table creation across worker processes
+CREATE_TABLES_LOCK = "kurve_kiosk_create_tables"
+CREATE_TABLES_LOCK_TIMEOUT = 30 # seconds
+
+# Create any missing tables - holds a MySQL named lock so workers booting together don't race the same DDL checks
+async def create_tables():
+  async with engine.begin() as conn:
+    # GET_LOCK returns 1 when acquired, 0 on timeout and NULL on error
+    acquired = await conn.scalar(
+      text("SELECT GET_LOCK(:name, :timeout)"),
+      {"name": CREATE_TABLES_LOCK, "timeout": CREATE_TABLES_LOCK_TIMEOUT}
+    )
+    if acquired != 1:
+      raise RuntimeError(f"Could not acquire the '{CREATE_TABLES_LOCK}' lock to create tables (GET_LOCK returned {acquired})")
+
+    try:
+      await conn.run_sync(Base.metadata.create_all)
+    finally:
+      try:
+        await conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": CREATE_TABLES_LOCK})
+      except Exception as e:
+        # Don't hide an error from create_all - MySQL drops the lock anyway once the connection closes
+        print(f"Warning: could not release the '{CREATE_TABLES_LOCK}' lock: {e}")
+
+# Open every pooled connection up front - SQLAlchemy has no minimum pool size, so check them all out at once
+async def warm_up_pool():
+  connections = await asyncio.gather(*(engine.connect() for _ in range(POOL_SIZE)))
+  await asyncio.gather(*(conn.close() for conn in connections))
+
 # Dependency to get a DB session
 async def get_db():
   async with AsyncSessionLocal() as session:
@@ -1,10 +1,12 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Query 
+from fastapi import FastAPI, Depends, HTTPException, status, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from contextlib import asynccontextmanager
-from typing import List
+from typing import List, Optional
 
-from .database import engine, Base, get_db
+from .database import engine, get_db, create_tables, warm_up_pool
 from . import models, schemas, crud
 from .dev_util import populate_database, clear_database
 
@@ -12,9 +14,10 @@ from .dev_util import populate_database, clear_database
 # This code runs ONCE when the application starts up
 async def lifespan(app: FastAPI):
   print("Application startup: Creating database tables if they don't exist.")
-  async with engine.begin() as conn:
-    await conn.run_sync(Base.metadata.create_all)
+  await create_tables()
   print("Database tables checked/created.")
+  await warm_up_pool()
+  print("Database connection pool warmed up.")
   
   yield # The application runs while the lifespan context manager is "yielded"
 
@@ -25,7 +28,8 @@ async def lifespan(app: FastAPI):
 # FastAPI application instance
 app = FastAPI(
   lifespan=lifespan,
-  title="Kurve Kiosk Customer API"
+  title="Kurve Kiosk Customer API",
+  default_response_class=ORJSONResponse # orjson encodes responses much faster than the stdlib json module
 )
 
 # CORS Middleware setup
@@ -53,21 +57,39 @@ async def create_new_customer(customer: schemas.CustomerCreate, db: AsyncSession
   - **age**: Customer's age (required, must be > 0)
   - **email**: Customer's email address (required, must be unique)
   """
-  customer_by_email = await crud.get_customer_by_email(db, email=customer.email)
-  if customer_by_email:
+  try:
+    return await crud.create_customer(db=db, customer=customer)
+  except IntegrityError:
+    # The unique index on email is the only constraint a new customer can violate
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-  return await crud.create_customer(db=db, customer=customer)
 
 # GET ALL Customers 
 @app.get("/api/customers/", response_model=schemas.PaginatedCustomerResponse, tags=["Customers"])
-async def get_customers_list(skip: int = Query(0, ge=0), limit: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_db)):
+async def get_customers_list(
+  after_id: Optional[int] = Query(None, ge=0),
+  skip: int = Query(0, ge=0),
+  limit: int = Query(10, ge=1, le=100),
+  db: AsyncSession = Depends(get_db)
+):
   """
-  Retrieve a paginated list of customers.
-  - **skip**: Number of records to skip (for pagination).
+  Retrieve a paginated list of customers, ordered by ID.
+  - **after_id**: Cursor from the previous page's `next_cursor` - returns records with an ID greater than this (preferred, cheap for deep pages).
+  - **skip**: Number of records to skip, only used when `after_id` is not given (for jumping straight to a page).
   - **limit**: Maximum number of records to return (for pagination).
   """
-  customers = await crud.get_customers(db, skip=skip, limit=limit)
-  return customers
+  customers = await crud.get_customers(db, after_id=after_id, skip=skip, limit=limit)
+  # Serialise straight to JSON with the model's prebuilt pydantic-core serializer - returning a Response
+  # skips FastAPI's per-request response_model validation and dict conversion (response_model is kept for the docs)
+  return Response(content=customers.model_dump_json(), media_type="application/json")
+
+# GET Customer count - declared before the `{customer_id}` route so "count" is not parsed as an ID
+@app.get("/api/customers/count", response_model=schemas.CustomerCountResponse, tags=["Customers"])
+async def get_customers_count(db: AsyncSession = Depends(get_db)):
+  """
+  Retrieve the total number of customers
+  """
+  total = await crud.get_customer_count(db)
+  return {"total": total}
 
 # GET SINGLE Customer by ID
 @app.get("/api/customers/{customer_id}", response_model=schemas.Customer, tags=["Customers"])
@@ -86,21 +108,16 @@ async def update_existing_customer(customer_id: int, customer_update: schemas.Cu
   """
   Update an existing customer by their ID
   Allows partial updates (fields not provided will not be changed)
-  Checks if the new email (if provided) is already in use by another customer
+  Rejects the update if the new email (if provided) is already in use by another customer
   """
-  # Check if the customer exists
-  existing_customer = await crud.get_customer(db, customer_id=customer_id)
-  if existing_customer is None:
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
-
-  # If email is being updated, check if the new email is already taken by another user
-  if customer_update.email and customer_update.email != existing_customer.email:
-    customer_with_new_email = await crud.get_customer_by_email(db, email=customer_update.email)
-    if customer_with_new_email and customer_with_new_email.id != customer_id:
-      raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New email already registered by another customer")
+  try:
+    updated_customer = await crud.update_customer(db=db, customer_id=customer_id, customer_update=customer_update)
+  except IntegrityError:
+    # The unique index on email is the only constraint an update can violate
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New email already registered by another customer")
 
-  # Proceed with the update
-  updated_customer = await crud.update_customer(db=db, customer_id=customer_id, customer_update=customer_update)
+  if updated_customer is None:
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
   return updated_customer
 
 # DELETE Customer
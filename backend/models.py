@@ -1,11 +1,13 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
 from .database import Base
 
 class Customer(Base):
   __tablename__ = "customers"
 
   # Define the table structure
-  id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-  name = Column(String(255), index=True, nullable=False) 
-  age = Column(Integer, nullable=False)
-  email = Column(String(255), unique=True, index=True, nullable=False) 
\ No newline at end of file
+  # The primary key is already indexed, and nothing looks customers up by name, so neither gets an extra index
+  id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+  name: Mapped[str] = mapped_column(String(255), nullable=False) 
+  age: Mapped[int] = mapped_column(Integer, nullable=False)
+  email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False) 
\ No newline at end of file
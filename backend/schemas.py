@@ -27,6 +27,9 @@ class CustomerUpdate(BaseModel):
 
 class PaginatedCustomerResponse(BaseModel):
   records: List[Customer]
+  next_cursor: Optional[int] = None # ID of the last record, pass as `after_id` to fetch the next page
   skip: int
   limit: int
+
+class CustomerCountResponse(BaseModel):
   total: int
\ No newline at end of file
@@ -1,5 +1,5 @@
 import { useState, useEffect, useRef } from 'react';
-import { getCustomers, deleteCustomer, type Customer, type PaginatedCustomersResponse } from './services/api.services';
+import { getCustomers, getCustomerCount, deleteCustomer, type Customer, type PaginatedCustomersResponse, type CustomerCountResponse } from './services/api.services';
 import AddCustomerForm from './components/AddCustomerForm';
 import EditCustomerForm from './components/EditCustomerForm';
 import Pagination from './components/Pagination';
@@ -28,11 +28,12 @@ function App() {
   const [showAddForm, setShowAddForm] = useState<boolean>(false);
   const [currentPage, setCurrentPage] = useState<number>(1);
   const [totalCustomers, setTotalCustomers] = useState<number>(0);
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
   const [error, setError] = useState<string | null>(null);
 
   const loaderTimerRef = useRef<number | null>(null);
 
-  const fetchCustomers = async (page: number = currentPage) => {
+  const fetchCustomers = async (page: number = currentPage, afterId: number | null = null) => {
     if (loaderTimerRef.current) {
       clearTimeout(loaderTimerRef.current);
     }
@@ -42,14 +43,19 @@ function App() {
     const startTime = Date.now();
 
     try {
-      const data: PaginatedCustomersResponse = await getCustomers(skip, ITEMS_PER_PAGE);
+      const [data, count]: [PaginatedCustomersResponse, CustomerCountResponse] = await Promise.all([
+        getCustomers(skip, ITEMS_PER_PAGE, afterId),
+        getCustomerCount(),
+      ]);
       setCustomers(data.records);
-      setTotalCustomers(data.total);
+      setNextCursor(data.next_cursor);
+      setTotalCustomers(count.total);
       setCurrentPage(page);
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'An unknown error occurred';
       setError(errorMessage);
       setCustomers([]);
+      setNextCursor(null);
       setTotalCustomers(0);
       console.error("Failed to fetch customers:", err);
     } finally {
@@ -126,7 +132,8 @@ function App() {
 
   const handlePageChange = (newPage: number) => {
     if (newPage >= 1 && newPage <= totalPages && newPage !== currentPage && !isPageLoading) {
-      fetchCustomers(newPage);
+      // Stepping forward one page can use the cursor, jumping anywhere else falls back to skip
+      fetchCustomers(newPage, newPage === currentPage + 1 ? nextCursor : null);
     }
   };
 
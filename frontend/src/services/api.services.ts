@@ -21,11 +21,15 @@ export interface CustomerUpdate {
 
 export interface PaginatedCustomersResponse {
   records: Customer[];
-  total: number;
+  next_cursor: number | null;
   skip: number;
   limit: number;
 }
 
+export interface CustomerCountResponse {
+  total: number;
+}
+
 // Helper function for making API requests
 async function request<T>(url: string, options?: RequestInit): Promise<T> {
   const response = await fetch(url, options);
@@ -44,9 +48,15 @@ async function request<T>(url: string, options?: RequestInit): Promise<T> {
 
 // ---- CRUD API Functions ---- //
 
-// GET ALL Customers
-export const getCustomers = async (skip: number=0, limit: number=10): Promise<PaginatedCustomersResponse> => {
-  return request<PaginatedCustomersResponse>(`${API_BASE_URL}/customers/?skip=${skip}&limit=${limit}`);
+// GET ALL Customers - pass `afterId` (the previous page's next_cursor) to use keyset pagination instead of skip
+export const getCustomers = async (skip: number=0, limit: number=10, afterId?: number | null): Promise<PaginatedCustomersResponse> => {
+  const cursor = afterId != null ? `after_id=${afterId}` : `skip=${skip}`;
+  return request<PaginatedCustomersResponse>(`${API_BASE_URL}/customers/?${cursor}&limit=${limit}`);
+};
+
+// GET Customer count
+export const getCustomerCount = async (): Promise<CustomerCountResponse> => {
+  return request<CustomerCountResponse>(`${API_BASE_URL}/customers/count`);
 };
 
 // GET SINGLE Customer